@@ -1,12 +1,16 @@
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from pyarrow import csv as pacsv
+from calendar import monthrange
 from datetime import datetime, timedelta
-import random
+import multiprocessing
 import os
 
-# Set random seed for reproducibility
-np.random.seed(42)
-random.seed(42)
+# Random seed for reproducibility; each month derives its own stream from it
+RANDOM_SEED = 42
 
 # US Auto Industry Seasonal Pattern - Monthly Multipliers
 MONTHLY_MULTIPLIERS = {
@@ -30,8 +34,43 @@ START_YEAR = 2015
 END_YEAR = 2024
 OUTPUT_FOLDER = 'car_sales_data'
 
-# Ensure output folder exists
-os.makedirs(OUTPUT_FOLDER, exist_ok=True)
+# Records to generate for each calendar month
+NUM_RECORDS_BY_MONTH = {month: int(BASE_RECORDS_PER_MONTH * multiplier)
+                        for month, multiplier in MONTHLY_MULTIPLIERS.items()}
+
+# Number of days in every month being generated
+DAYS_IN_MONTH_BY_YEAR = {(year, month): monthrange(year, month)[1]
+                         for year in range(START_YEAR, END_YEAR + 1) for month in range(1, 13)}
+
+# 'csv' writes one sales_YYYY_MM.csv per month (what the notebooks read);
+# 'parquet' writes a year=YYYY/month=MM partitioned Parquet dataset instead
+OUTPUT_FORMAT = 'csv'
+
+# Months are generated and written in chunks of this many records
+RECORDS_PER_CHUNK = 16_384
+
+# CSV output: none of the generated values contain commas or quotes, so they are
+# written unquoted; each chunk is formatted as one batch and one write() call
+CSV_WRITE_OPTIONS = pacsv.WriteOptions(quoting_style='none', batch_size=RECORDS_PER_CHUNK)
+
+# Column layout of the generated sales files
+SALES_SCHEMA = pa.schema([
+    ('sale_id', pa.string()),
+    ('sale_date', pa.string()),
+    ('customer_id', pa.string()),
+    ('car_make', pa.string()),
+    ('car_model', pa.string()),
+    ('car_year', pa.int16()),
+    ('category', pa.string()),
+    ('color', pa.string()),
+    ('mileage', pa.int8()),
+    ('sale_price', pa.float64()),
+    ('payment_method', pa.string()),
+    ('dealership', pa.string()),
+    ('salesperson', pa.string()),
+    ('state', pa.string()),
+    ('commission', pa.float64()),
+])
 
 # Car makes and models with realistic prices
 car_inventory = [
@@ -73,184 +112,211 @@ salespeople = [
 
 states = ['CA', 'TX', 'FL', 'NY', 'IL', 'PA', 'OH', 'GA', 'NC', 'MI']
 
+# Inventory and attribute values as arrays so a month's draws can be gathered by index
+car_makes = np.array([car['make'] for car in car_inventory], dtype=object)
+car_models = np.array([car['model'] for car in car_inventory], dtype=object)
+car_categories = np.array([car['category'] for car in car_inventory], dtype=object)
+car_base_price_cents = np.array([car['base_price'] * 100 for car in car_inventory], dtype=np.int64)
+payment_method_names = np.array(payment_methods, dtype=object)
+color_names = np.array(colors, dtype=object)
+dealership_names = np.array(dealerships, dtype=object)
+salesperson_names = np.array(salespeople, dtype=object)
+state_names = np.array(states, dtype=object)
 
-def get_days_in_month(year, month):
-    """Get the number of days in a given month"""
-    if month in [1, 3, 5, 7, 8, 10, 12]:
-        return 31
-    elif month in [4, 6, 9, 11]:
-        return 30
-    else:  # February
-        if year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
-            return 29
-        else:
-            return 28
 
+def format_ids(prefix, numbers, width):
+    """Format an array of ID numbers as zero-padded strings, e.g. CUST0001234"""
+    digits = pc.utf8_lpad(pc.cast(pa.array(numbers), pa.string()), width, '0')
+    return pc.binary_join_element_wise(prefix, digits, '')
 
-def generate_month_data(year, month, num_records, customer_id_offset, sale_id_offset):
-    """Generate sales data for a specific month"""
-    sales_data = []
-    days_in_month = get_days_in_month(year, month)
-    
-    # Adjust car year based on the data year
-    if year <= 2016:
-        car_year_choices = [year - 1, year]
-        car_year_weights = [0.3, 0.7]
-    else:
-        car_year_choices = [year - 1, year]
-        car_year_weights = [0.3, 0.7]
+
+def draw_month(year, month, num_records, rng):
+    """Draw every random value for a month in one pass, as numeric arrays"""
+    days_in_month = DAYS_IN_MONTH_BY_YEAR[(year, month)]
     
-    for i in range(num_records):
-        # Random day within the month
-        day = random.randint(1, days_in_month)
-        sale_date = datetime(year, month, day)
-        
-        # Select random car
-        car = random.choice(car_inventory)
-        
-        # Add price variation (-5% to +15%)
-        price_variation = random.uniform(-0.05, 0.15)
-        sale_price = round(car['base_price'] * (1 + price_variation), 2)
-        
-        # Generate other attributes
-        color = random.choice(colors)
-        dealership = random.choice(dealerships)
-        payment_method = random.choices(payment_methods, weights=finance_weights)[0]
-        salesperson = random.choice(salespeople)
-        state = random.choice(states)
-        
-        # Car year
-        car_year = random.choices(car_year_choices, weights=car_year_weights)[0]
-        
+    return {
+        # Random day within the month, in date order. Every other value is drawn
+        # independently of the day, so sorting the days alone orders the records.
+        'day': np.sort(rng.integers(1, days_in_month + 1, size=num_records, dtype=np.int8)),
+        'car_idx': rng.integers(0, len(car_inventory), size=num_records),
+        # Price variation (-5% to +15%) and commission rate (2-5%) in parts per million
+        'price_variation_ppm': rng.integers(-50_000, 150_001, size=num_records),
+        'commission_rate_ppm': rng.integers(20_000, 50_001, size=num_records),
+        # Car year: 70% current model year, 30% previous
+        'car_year': np.where(rng.random(num_records) < 0.7, year, year - 1).astype(np.int16),
+        # Payment method drawn by index from the weighted distribution
+        'payment_idx': rng.choice(len(payment_methods), size=num_records, p=finance_weights),
+        'color_idx': rng.integers(0, len(colors), size=num_records),
         # Mileage (new cars have 5-50 miles)
-        mileage = random.randint(5, 50)
-        
-        # Customer ID (anonymous)
-        customer_id = f'CUST{customer_id_offset + i:07d}'
-        
-        # Sale ID
-        sale_id = f'SALE{sale_id_offset + i:08d}'
-        
-        # Commission (2-5% of sale price)
-        commission_rate = random.uniform(0.02, 0.05)
-        commission = round(sale_price * commission_rate, 2)
-        
-        sales_data.append({
-            'sale_id': sale_id,
-            'sale_date': sale_date.strftime('%Y-%m-%d'),
-            'customer_id': customer_id,
-            'car_make': car['make'],
-            'car_model': car['model'],
-            'car_year': car_year,
-            'category': car['category'],
-            'color': color,
-            'mileage': mileage,
-            'sale_price': sale_price,
-            'payment_method': payment_method,
-            'dealership': dealership,
-            'salesperson': salesperson,
-            'state': state,
-            'commission': commission
-        })
+        'mileage': rng.integers(5, 51, size=num_records, dtype=np.int8),
+        'dealership_idx': rng.integers(0, len(dealerships), size=num_records),
+        'salesperson_idx': rng.integers(0, len(salespeople), size=num_records),
+        'state_idx': rng.integers(0, len(states), size=num_records),
+    }
+
+
+def get_sale_price_cents(draws):
+    """Sale price in whole cents for each draw, rounded half-up"""
+    return (car_base_price_cents[draws['car_idx']] * (1_000_000 + draws['price_variation_ppm']) + 500_000) // 1_000_000
+
+
+def generate_month_data(year, month, draws, customer_id_offset, sale_id_offset):
+    """Build sales data for a chunk of a month's draws as a dict of column arrays"""
+    num_records = len(draws['day'])
+    sale_date = np.char.add(f'{year}-{month:02d}-', np.char.zfill(draws['day'].astype('U2'), 2))
+    car_idx = draws['car_idx']
+    
+    # Sale price and commission in whole cents, rounded half-up
+    sale_price_cents = get_sale_price_cents(draws)
+    commission_cents = (sale_price_cents * draws['commission_rate_ppm'] + 500_000) // 1_000_000
     
-    return sales_data
-
-
-# Main generation loop
-print("=" * 80)
-print("CAR SALES DATA GENERATOR - US AUTO INDUSTRY SEASONAL PATTERN")
-print("=" * 80)
-print(f"\nGenerating data from {START_YEAR} to {END_YEAR}")
-print(f"Base records per month: {BASE_RECORDS_PER_MONTH:,}")
-print(f"Output folder: {OUTPUT_FOLDER}/")
-print("\nMonthly multipliers applied:")
-for month_num, multiplier in MONTHLY_MULTIPLIERS.items():
-    month_name = datetime(2024, month_num, 1).strftime('%B')
-    expected_records = int(BASE_RECORDS_PER_MONTH * multiplier)
-    print(f"  {month_name:12s} ({month_num:2d}): {multiplier:.2f}x = ~{expected_records:,} records")
-
-print("\n" + "=" * 80)
-print("Starting generation...\n")
-
-total_records = 0
-total_revenue = 0
-customer_id_offset = 1000000
-sale_id_offset = 20000000
-monthly_stats = []
-
-for year in range(START_YEAR, END_YEAR + 1):
-    for month in range(1, 13):
-        # Calculate number of records for this month
-        num_records = int(BASE_RECORDS_PER_MONTH * MONTHLY_MULTIPLIERS[month])
-        
-        # Generate data for this month
-        month_data = generate_month_data(year, month, num_records, customer_id_offset, sale_id_offset)
-        
-        # Create DataFrame
-        df = pd.DataFrame(month_data)
-        df = df.sort_values('sale_date').reset_index(drop=True)
-        
-        # Calculate revenue for this month
-        month_revenue = df['sale_price'].sum()
-        
-        # Save to CSV file
+    # Customer ID (anonymous) and Sale ID are numbered in record order
+    record_offsets = np.arange(num_records)
+    
+    return {
+        'sale_id': format_ids('SALE', sale_id_offset + record_offsets, 8),
+        'sale_date': sale_date,
+        'customer_id': format_ids('CUST', customer_id_offset + record_offsets, 7),
+        'car_make': car_makes[car_idx],
+        'car_model': car_models[car_idx],
+        'car_year': draws['car_year'],
+        'category': car_categories[car_idx],
+        'color': color_names[draws['color_idx']],
+        'mileage': draws['mileage'],
+        'sale_price': sale_price_cents / 100,
+        'payment_method': payment_method_names[draws['payment_idx']],
+        'dealership': dealership_names[draws['dealership_idx']],
+        'salesperson': salesperson_names[draws['salesperson_idx']],
+        'state': state_names[draws['state_idx']],
+        'commission': commission_cents / 100
+    }
+
+
+def generate_and_write_month(year, month, num_records, customer_id_offset, sale_id_offset):
+    """Generate one month of sales, save it in OUTPUT_FORMAT and return (revenue, filename)"""
+    # Seed from (seed, year, month) so output doesn't depend on worker scheduling
+    rng = np.random.default_rng([RANDOM_SEED, year, month])
+    draws = draw_month(year, month, num_records, rng)
+    
+    # Calculate revenue for this month, exactly in cents
+    month_revenue = get_sale_price_cents(draws).sum() / 100
+    
+    if OUTPUT_FORMAT == 'parquet':
+        partition_folder = f"{OUTPUT_FOLDER}/year={year}/month={month:02d}"
+        os.makedirs(partition_folder, exist_ok=True)
+        output_filename = f"{partition_folder}/sales.parquet"
+        writer = pq.ParquetWriter(output_filename, SALES_SCHEMA)
+    else:
         output_filename = f"{OUTPUT_FOLDER}/sales_{year}_{month:02d}.csv"
-        df.to_csv(output_filename, index=False)
-        
-        # Update counters
-        total_records += num_records
-        total_revenue += month_revenue
-        customer_id_offset += num_records
-        sale_id_offset += num_records
-        
-        # Store stats
-        monthly_stats.append({
-            'year': year,
-            'month': month,
-            'records': num_records,
-            'revenue': month_revenue
-        })
-        
-        # Progress reporting
-        month_name = datetime(year, month, 1).strftime('%B')
-        print(f"✓ {year}-{month:02d} ({month_name:12s}): {num_records:>7,} records | "
-              f"Revenue: ${month_revenue:>14,.2f} | File: {output_filename}")
-
-print("\n" + "=" * 80)
-print("GENERATION COMPLETE!")
-print("=" * 80)
-
-# Summary statistics
-print(f"\nTotal files generated: {len(monthly_stats)}")
-print(f"Total records: {total_records:,}")
-print(f"Total revenue: ${total_revenue:,.2f}")
-print(f"Average sale price: ${total_revenue / total_records:,.2f}")
-
-# Seasonal analysis
-stats_df = pd.DataFrame(monthly_stats)
-print("\n" + "-" * 80)
-print("SEASONAL ANALYSIS")
-print("-" * 80)
-
-print("\nAverage records by month (across all years):")
-monthly_avg = stats_df.groupby('month')['records'].mean()
-for month_num, avg_records in monthly_avg.items():
-    month_name = datetime(2024, month_num, 1).strftime('%B')
-    multiplier = MONTHLY_MULTIPLIERS[month_num]
-    print(f"  {month_name:12s}: {avg_records:>8,.0f} records ({multiplier:.2f}x)")
-
-print("\nTotal records by year:")
-yearly_totals = stats_df.groupby('year')['records'].sum()
-for year, total in yearly_totals.items():
-    print(f"  {year}: {total:>10,} records")
-
-# Calculate quarterly stats
-stats_df['quarter'] = stats_df['month'].apply(lambda m: (m - 1) // 3 + 1)
-quarterly_avg = stats_df.groupby('quarter')['records'].sum()
-print("\nTotal records by quarter (all years combined):")
-for quarter, total in quarterly_avg.items():
-    print(f"  Q{quarter}: {total:>10,} records")
-
-print("\n" + "=" * 80)
-print(f"All files saved in: {OUTPUT_FOLDER}/")
-print("=" * 80)
+        writer = pacsv.CSVWriter(output_filename, SALES_SCHEMA, write_options=CSV_WRITE_OPTIONS)
+    
+    # Build and write the string columns a chunk at a time to keep peak memory low;
+    # all random draws are already made, so the output doesn't depend on the chunk size
+    with writer:
+        for start in range(0, num_records, RECORDS_PER_CHUNK):
+            chunk_draws = {name: values[start:start + RECORDS_PER_CHUNK] for name, values in draws.items()}
+            chunk = generate_month_data(year, month, chunk_draws, customer_id_offset + start, sale_id_offset + start)
+            writer.write_table(pa.Table.from_pydict(chunk, schema=SALES_SCHEMA))
+    
+    return month_revenue, output_filename
+
+
+def generate_and_write_month_task(task):
+    """Unpack a (year, month, num_records, customer_id_offset, sale_id_offset) task for Pool.imap"""
+    return generate_and_write_month(*task)
+
+
+if __name__ == '__main__':
+    # Main generation loop
+    print("=" * 80)
+    print("CAR SALES DATA GENERATOR - US AUTO INDUSTRY SEASONAL PATTERN")
+    print("=" * 80)
+    print(f"\nGenerating data from {START_YEAR} to {END_YEAR}")
+    print(f"Base records per month: {BASE_RECORDS_PER_MONTH:,}")
+    print(f"Output folder: {OUTPUT_FOLDER}/ ({OUTPUT_FORMAT})")
+    print("\nMonthly multipliers applied:")
+    for month_num, multiplier in MONTHLY_MULTIPLIERS.items():
+        month_name = datetime(2024, month_num, 1).strftime('%B')
+        print(f"  {month_name:12s} ({month_num:2d}): {multiplier:.2f}x = ~{NUM_RECORDS_BY_MONTH[month_num]:,} records")
+
+    print("\n" + "=" * 80)
+    print("Starting generation...\n")
+
+    # Ensure output folder exists
+    os.makedirs(OUTPUT_FOLDER, exist_ok=True)
+
+    # Months are independent, so work out every month's size and ID offsets up front
+    total_records = 0
+    total_revenue = 0
+    customer_id_offset = 1000000
+    sale_id_offset = 20000000
+    tasks = []
+
+    for year in range(START_YEAR, END_YEAR + 1):
+        for month in range(1, 13):
+            num_records = NUM_RECORDS_BY_MONTH[month]
+            tasks.append((year, month, num_records, customer_id_offset, sale_id_offset))
+            customer_id_offset += num_records
+            sale_id_offset += num_records
+
+    # Generate and save all months in parallel, reporting each month in order as it finishes
+    monthly_stats = []
+
+    with multiprocessing.Pool(os.cpu_count()) as pool:
+        month_results = pool.imap(generate_and_write_month_task, tasks)
+        for (year, month, num_records, _, _), (month_revenue, output_filename) in zip(tasks, month_results):
+            # Update counters
+            total_records += num_records
+            total_revenue += month_revenue
+            
+            # Store stats
+            monthly_stats.append({
+                'year': year,
+                'month': month,
+                'records': num_records,
+                'revenue': month_revenue
+            })
+            
+            # Progress reporting
+            month_name = datetime(year, month, 1).strftime('%B')
+            print(f"✓ {year}-{month:02d} ({month_name:12s}): {num_records:>7,} records | "
+                  f"Revenue: ${month_revenue:>14,.2f} | File: {output_filename}")
+
+    print("\n" + "=" * 80)
+    print("GENERATION COMPLETE!")
+    print("=" * 80)
+
+    # Summary statistics
+    print(f"\nTotal files generated: {len(monthly_stats)}")
+    print(f"Total records: {total_records:,}")
+    print(f"Total revenue: ${total_revenue:,.2f}")
+    print(f"Average sale price: ${total_revenue / total_records:,.2f}")
+
+    # Seasonal analysis
+    stats_df = pd.DataFrame(monthly_stats)
+    print("\n" + "-" * 80)
+    print("SEASONAL ANALYSIS")
+    print("-" * 80)
+
+    print("\nAverage records by month (across all years):")
+    monthly_avg = stats_df.groupby('month')['records'].mean()
+    for month_num, avg_records in monthly_avg.items():
+        month_name = datetime(2024, month_num, 1).strftime('%B')
+        multiplier = MONTHLY_MULTIPLIERS[month_num]
+        print(f"  {month_name:12s}: {avg_records:>8,.0f} records ({multiplier:.2f}x)")
+
+    print("\nTotal records by year:")
+    yearly_totals = stats_df.groupby('year')['records'].sum()
+    for year, total in yearly_totals.items():
+        print(f"  {year}: {total:>10,} records")
+
+    # Calculate quarterly stats
+    stats_df['quarter'] = stats_df['month'].apply(lambda m: (m - 1) // 3 + 1)
+    quarterly_avg = stats_df.groupby('quarter')['records'].sum()
+    print("\nTotal records by quarter (all years combined):")
+    for quarter, total in quarterly_avg.items():
+        print(f"  Q{quarter}: {total:>10,} records")
+
+    print("\n" + "=" * 80)
+    print(f"All files saved in: {OUTPUT_FOLDER}/")
+    print("=" * 80)